@@ -2,26 +2,22 @@
 
 import click
 
-from strava_gears.core import StravaClient
+from strava_gears.cli.common import get_client
 
 
 @click.command()
-@click.option("--limit", default=10, help="Number of activities to list")
+@click.option("--limit", type=int, help="Number of activities to list (default: 10, or all within --after/--before)")
+@click.option("--after", type=click.DateTime(), help="Only list activities started after this date (UTC)")
+@click.option("--before", type=click.DateTime(), help="Only list activities started before this date (UTC)")
+@click.option("--type", "activity_types", multiple=True, help="Only list activities of this type (repeatable)")
 @click.pass_context
-def list_activities(ctx, limit):
+def list_activities(ctx, limit, after, before, activity_types):
     """List recent activities."""
-    config = ctx.obj["config"]
-    access_token = config.get_access_token()
-
-    if not access_token:
-        click.echo("Not authenticated. Run 'strava-gears auth' first.", err=True)
-        raise click.Abort()
-
-    refresh_token = config.get_refresh_token()
-    expires_at = config.get_expires_at()
+    client = get_client(ctx)
     try:
-        client = StravaClient(access_token, refresh_token, expires_at)
-        activities = client.get_activities(limit=limit)
+        if limit is None and after is None and before is None:
+            limit = 10
+        activities = client.get_activities(limit=limit, after=after, before=before, activity_types=activity_types)
         gear_list = client.get_athlete_gear()
 
         if not activities:
@@ -49,17 +45,8 @@ def list_activities(ctx, limit):
 @click.pass_context
 def list_gear(ctx):
     """List available gear."""
-    config = ctx.obj["config"]
-    access_token = config.get_access_token()
-
-    if not access_token:
-        click.echo("Not authenticated. Run 'strava-gears auth' first.", err=True)
-        raise click.Abort()
-
-    refresh_token = config.get_refresh_token()
-    expires_at = config.get_expires_at()
+    client = get_client(ctx)
     try:
-        client = StravaClient(access_token, refresh_token, expires_at)
         gear_list = client.get_athlete_gear()
 
         if not gear_list:
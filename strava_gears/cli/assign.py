@@ -1,8 +1,11 @@
 """Gear assignment commands."""
 
+from pathlib import Path
+
 import click
 
-from strava_gears.core import GearAssigner, StravaClient, create_activity_type_rule
+from strava_gears.cli.common import get_client
+from strava_gears.core import GearAssigner, GearPlan, GearPlanner, create_activity_type_rule
 
 
 @click.command()
@@ -11,17 +14,8 @@ from strava_gears.core import GearAssigner, StravaClient, create_activity_type_r
 @click.pass_context
 def assign_gear(ctx, activity_id, gear_id):
     """Assign gear to a specific activity."""
-    config = ctx.obj["config"]
-    access_token = config.get_access_token()
-
-    if not access_token:
-        click.echo("Not authenticated. Run 'strava-gears auth' first.", err=True)
-        raise click.Abort()
-
-    refresh_token = config.get_refresh_token()
-    expires_at = config.get_expires_at()
+    client = get_client(ctx)
     try:
-        client = StravaClient(access_token, refresh_token, expires_at)
         client.update_activity_gear(activity_id, gear_id)
         click.echo(f"Successfully assigned gear to activity {activity_id}")
     except Exception as e:
@@ -32,47 +26,107 @@ def assign_gear(ctx, activity_id, gear_id):
 @click.command()
 @click.option("--activity-type", required=True, help="Activity type (e.g., Ride, Run)")
 @click.option("--gear-id", required=True, help="Gear ID to assign")
-@click.option("--limit", default=30, help="Number of activities to process")
+@click.option("--limit", type=int, help="Number of activities to process (default: 30, or all within --after/--before)")
+@click.option("--after", type=click.DateTime(), help="Only process activities started after this date (UTC)")
+@click.option("--before", type=click.DateTime(), help="Only process activities started before this date (UTC)")
 @click.option("--dry-run", is_flag=True, help="Show what would be done without making changes")
+@click.option("--export", "export_path", type=click.Path(dir_okay=False), help="Write the change plan to a JSON file")
+@click.option("--explain", is_flag=True, help="Explain the matching rule per activity and show rule statistics")
 @click.pass_context
-def auto_assign(ctx, activity_type, gear_id, limit, dry_run):
+def auto_assign(ctx, activity_type, gear_id, limit, after, before, dry_run, export_path, explain):
     """Automatically assign gear to activities based on type."""
-    config = ctx.obj["config"]
-    access_token = config.get_access_token()
-
-    if not access_token:
-        click.echo("Not authenticated. Run 'strava-gears auth' first.", err=True)
-        raise click.Abort()
-
-    refresh_token = config.get_refresh_token()
-    expires_at = config.get_expires_at()
+    client = get_client(ctx)
     try:
-        client = StravaClient(access_token, refresh_token, expires_at)
-        activities = client.get_activities(limit=limit)
+        if limit is None and after is None and before is None:
+            limit = 30
+        activities = client.get_activities(limit=limit, after=after, before=before)
 
-        assigner = GearAssigner()
+        assigner = GearAssigner(trace=explain)
         assigner.add_rule(create_activity_type_rule(activity_type, gear_id))
+        planner = GearPlanner(assigner)
+        plan = planner.plan(activities)
 
-        matched_count = 0
-        for activity in activities:
-            if activity.gear_id == gear_id:
-                continue  # Skip if gear already assigned
-
-            matched_gear = assigner.find_matching_gear(activity)
-            if matched_gear:
-                matched_count += 1
-                if dry_run:
-                    click.echo(f"Would assign gear {gear_id} to activity {activity.id} ({activity.name})")
-                else:
-                    client.update_activity_gear(activity.id, gear_id)
-                    click.echo(f"Assigned gear {gear_id} to activity {activity.id} ({activity.name})")
-
-        if matched_count == 0:
+        if explain:
+            for explanation in plan.explanations:
+                click.echo(str(explanation))
+            click.echo("\nRule statistics:")
+            for stats in assigner.get_stats():
+                click.echo(
+                    f"  {stats.name}: {stats.hits}/{stats.evaluations} hits, "
+                    f"{stats.total_time * 1000:.3f} ms total, {stats.mean_time * 1e6:.1f} us/eval"
+                )
+            click.echo()
+
+        if export_path:
+            plan.export(Path(export_path))
+            click.echo(f"Wrote plan with {len(plan)} changes to {export_path}")
+
+        if not plan:
             click.echo(f"No activities of type '{activity_type}' found without this gear.")
-        elif dry_run:
-            click.echo(f"\nDry run complete. Would update {matched_count} activities.")
-        else:
-            click.echo(f"\nSuccessfully updated {matched_count} activities.")
+            return
+
+        if dry_run:
+            for rule_name, changes in plan.by_rule().items():
+                click.echo(f"{rule_name}:")
+                for change in changes:
+                    click.echo(
+                        f"  Would assign gear {change.new_gear_id} to activity {change.activity_id} "
+                        f"({change.activity_name}), currently {change.old_gear_id or 'none'}"
+                    )
+            click.echo(f"\nDry run complete. Would update {len(plan)} activities.")
+            return
+
+        def report(change):
+            click.echo(f"Assigned gear {change.new_gear_id} to activity {change.activity_id} ({change.activity_name})")
+
+        updated = plan.execute(client, on_change=report)
+        click.echo(f"\nSuccessfully updated {updated} activities.")
     except Exception as e:
         click.echo(f"Error auto-assigning gear: {e}", err=True)
         raise click.Abort()
+
+
+@click.command()
+@click.option(
+    "--plan",
+    "plan_path",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Plan file written by 'auto-assign --export'",
+)
+@click.option("--dry-run", is_flag=True, help="Show what would be done without making changes")
+@click.pass_context
+def apply_plan(ctx, plan_path, dry_run):
+    """Apply a previously exported gear plan.
+
+    Changes are skipped if the activity's gear no longer matches the gear
+    recorded in the plan.
+    """
+    client = get_client(ctx)
+    try:
+        plan = GearPlan.load(Path(plan_path))
+
+        if not plan:
+            click.echo("Plan contains no changes.")
+            return
+
+        if dry_run:
+            for change in plan:
+                click.echo(
+                    f"Would assign gear {change.new_gear_id} to activity {change.activity_id} "
+                    f"({change.activity_name}) if it still has {change.old_gear_id or 'no gear'}"
+                )
+            click.echo(f"\nDry run complete. Plan contains {len(plan)} changes.")
+            return
+
+        def report(change):
+            click.echo(f"Assigned gear {change.new_gear_id} to activity {change.activity_id} ({change.activity_name})")
+
+        def skip(change):
+            click.echo(f"Skipped activity {change.activity_id} ({change.activity_name}): gear changed since planning")
+
+        updated = plan.execute(client, on_change=report, on_skip=skip, verify=True)
+        click.echo(f"\nSuccessfully updated {updated} of {len(plan)} activities.")
+    except Exception as e:
+        click.echo(f"Error applying plan: {e}", err=True)
+        raise click.Abort()
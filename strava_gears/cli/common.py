@@ -0,0 +1,53 @@
+"""Shared helpers for CLI commands."""
+
+from pathlib import Path
+
+import click
+import requests
+
+from strava_gears.core import SharedRateLimiter, StravaClient
+
+
+def get_client(ctx, requests_session: requests.Session | None = None) -> StravaClient:
+    """Create a Strava client for a command.
+
+    Serves all requests from the replay archive if one was given and no
+    session is passed, otherwise uses the stored tokens and a rate limiter
+    shared through the configured storage. Tokens refreshed during the
+    command are written back to storage when the command finishes.
+
+    Args:
+        ctx: Click context
+        requests_session: HTTP session for API requests (e.g., a RecordingSession)
+
+    Returns:
+        StravaClient instance
+    """
+    replay = ctx.obj.get("replay")
+    if replay and requests_session is None:
+        return StravaClient.from_archive(Path(replay))
+
+    config = ctx.obj["config"]
+    access_token = config.get_access_token()
+
+    if not access_token:
+        click.echo("Not authenticated. Run 'strava-gears auth' first.", err=True)
+        raise click.Abort()
+
+    client = StravaClient(
+        access_token,
+        config.get_refresh_token(),
+        config.get_expires_at(),
+        requests_session=requests_session,
+        rate_limiter=SharedRateLimiter(config.storage),
+    )
+
+    def save_tokens():
+        # Strava rotates refresh tokens, so persist any refresh done during the
+        # command for other workers sharing the same storage.
+        tokens = client.get_tokens()
+        if tokens["access_token"] != access_token:
+            config.set_access_token(tokens["access_token"], tokens["refresh_token"], tokens["expires_at"])
+
+    ctx.call_on_close(save_tokens)
+    return client
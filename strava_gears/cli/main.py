@@ -1,22 +1,32 @@
 """Command-line interface for strava-gears."""
 
+from pathlib import Path
+
 import click
 from dotenv import load_dotenv
 
 from strava_gears.cli.activities import list_activities, list_gear
-from strava_gears.cli.assign import assign_gear, auto_assign
-from strava_gears.core import Config, StravaAuth, StravaClient
+from strava_gears.cli.assign import apply_plan, assign_gear, auto_assign
+from strava_gears.cli.common import get_client
+from strava_gears.core import Config, FixtureArchive, RecordingSession, StravaAuth, StravaClient
 
 # Load environment variables from .env file
 load_dotenv()
 
 
 @click.group()
+@click.option(
+    "--replay",
+    envvar="STRAVA_GEARS_REPLAY",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Serve all API reads from a recorded archive instead of Strava",
+)
 @click.pass_context
-def cli(ctx):
+def cli(ctx, replay):
     """Automate gear assignment for Strava activities."""
     ctx.ensure_object(dict)
     ctx.obj["config"] = Config()
+    ctx.obj["replay"] = replay
 
 
 @cli.command()
@@ -65,11 +75,32 @@ def status(ctx):
         click.echo("Please run 'strava-gears auth' to re-authenticate.")
 
 
+@cli.command()
+@click.option("--archive", required=True, type=click.Path(dir_okay=False), help="Archive file to write (.json.gz)")
+@click.option("--after", type=click.DateTime(), help="Only record activities started after this date (UTC)")
+@click.option("--before", type=click.DateTime(), help="Only record activities started before this date (UTC)")
+@click.pass_context
+def record(ctx, archive, after, before):
+    """Record athlete, gear and activities to an archive for offline replay."""
+    fixtures = FixtureArchive()
+    client = get_client(ctx, requests_session=RecordingSession(fixtures))
+    try:
+        for gear in client.get_athlete_gear():
+            client.get_gear(gear.id)
+        activities = client.get_activities(limit=None, after=after, before=before)
+        fixtures.save(Path(archive))
+        click.echo(f"Recorded {len(activities)} activities to {archive}")
+    except Exception as e:
+        click.echo(f"Error recording archive: {e}", err=True)
+        raise click.Abort()
+
+
 # Register commands from other modules
 cli.add_command(list_activities, name="list-activities")
 cli.add_command(list_gear, name="list-gear")
 cli.add_command(assign_gear, name="assign")
 cli.add_command(auto_assign, name="auto-assign")
+cli.add_command(apply_plan, name="apply")
 
 
 if __name__ == "__main__":
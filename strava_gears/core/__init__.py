@@ -6,17 +6,36 @@ from strava_gears.core.config import Config
 from strava_gears.core.heuristics import (
     GearAssigner,
     GearRule,
+    RuleExplanation,
+    RuleStats,
     create_activity_type_rule,
     create_distance_rule,
     create_name_pattern_rule,
 )
+from strava_gears.core.planner import GearChange, GearPlan, GearPlanner
+from strava_gears.core.ratelimit import SharedRateLimiter
+from strava_gears.core.replay import FixtureArchive, RecordingSession, ReplaySession
+from strava_gears.core.storage import RedisStorage, SQLiteStorage, Storage, open_storage
 
 __all__ = [
     "StravaClient",
     "StravaAuth",
     "Config",
+    "FixtureArchive",
+    "RecordingSession",
+    "ReplaySession",
+    "SharedRateLimiter",
+    "Storage",
+    "SQLiteStorage",
+    "RedisStorage",
+    "open_storage",
     "GearRule",
     "GearAssigner",
+    "RuleStats",
+    "RuleExplanation",
+    "GearChange",
+    "GearPlan",
+    "GearPlanner",
     "create_activity_type_rule",
     "create_distance_rule",
     "create_name_pattern_rule",
@@ -1,7 +1,40 @@
 """Strava API client for managing gear assignments."""
 
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import UTC, datetime
+from itertools import islice
+from pathlib import Path
+
+import requests
 from stravalib.client import Client
-from stravalib.model import DetailedActivity, SummaryGear
+from stravalib.model import DetailedActivity, SummaryActivity, SummaryGear
+from stravalib.strava_model import DetailedGear
+from stravalib.util.limiter import RateLimiter
+
+from strava_gears.core.heuristics import type_name
+from strava_gears.core.replay import FixtureArchive, ReplayClient
+
+PAGE_SIZE = 200
+
+
+def to_utc(value: datetime | None) -> datetime | None:
+    """Convert a datetime to an aware UTC datetime.
+
+    Naive datetimes are taken to be UTC, as stravalib does.
+
+    Args:
+        value: Datetime to convert
+
+    Returns:
+        Aware UTC datetime, or None
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
 
 
 class StravaClient:
@@ -12,6 +45,9 @@ class StravaClient:
         access_token: str | None = None,
         refresh_token: str | None = None,
         expires_at: int | None = None,
+        requests_session: requests.Session | None = None,
+        rate_limiter: RateLimiter | None = None,
+        client: Client | None = None,
     ):
         """Initialize the Strava client.
 
@@ -19,8 +55,11 @@ class StravaClient:
             access_token: Strava API access token
             refresh_token: Strava API refresh token (optional, enables auto token refresh)
             expires_at: Token expiration timestamp (optional, enables auto token refresh)
+            requests_session: HTTP session for API requests (e.g., a RecordingSession)
+            rate_limiter: Rate limiter (e.g., a SharedRateLimiter); defaults to stravalib's per-process limiter
+            client: Preconfigured stravalib client to use instead of creating one
         """
-        self.client = Client()
+        self.client = client or Client(requests_session=requests_session, rate_limiter=rate_limiter)
         if access_token:
             self.client.access_token = access_token
         if refresh_token:
@@ -28,6 +67,21 @@ class StravaClient:
         if expires_at:
             self.client.token_expires = expires_at
 
+    @classmethod
+    def from_archive(cls, path: Path) -> "StravaClient":
+        """Create a client that serves all reads from a recorded fixture archive.
+
+        No network requests are made and no tokens are needed; updates raise
+        an error.
+
+        Args:
+            path: Archive written by a recording client
+
+        Returns:
+            StravaClient instance
+        """
+        return cls(client=ReplayClient(FixtureArchive.load(path)))
+
     def set_access_token(
         self,
         access_token: str,
@@ -47,20 +101,123 @@ class StravaClient:
         if expires_at:
             self.client.token_expires = expires_at
 
+    def get_tokens(self) -> dict:
+        """Get the current token information.
+
+        stravalib refreshes expired tokens automatically, so these may differ
+        from the tokens the client was created with.
+
+        Returns:
+            Token information dict with access_token, refresh_token and expires_at
+        """
+        return {
+            "access_token": self.client.access_token,
+            "refresh_token": self.client.refresh_token,
+            "expires_at": self.client.token_expires,
+        }
+
     def get_athlete(self):
         """Get the authenticated athlete information."""
         return self.client.get_athlete()
 
-    def get_activities(self, limit: int = 30):
-        """Get recent activities for the authenticated athlete.
+    def get_activities(
+        self,
+        limit: int | None = 30,
+        after: datetime | None = None,
+        before: datetime | None = None,
+        activity_types: Iterable[str] | None = None,
+        max_workers: int = 4,
+    ) -> list[SummaryActivity]:
+        """Get activities for the authenticated athlete, most recent first.
+
+        The time window is filtered by the Strava API; naive datetimes are
+        taken to be UTC. Without a limit, all pages of the window are fetched
+        in parallel (see `_get_all_activities`). With a limit, pages are
+        fetched lazily newest first until enough activities are found.
+        Strava has no type filter, so types are matched locally.
 
         Args:
-            limit: Maximum number of activities to retrieve
+            limit: Maximum number of activities to retrieve (None for all)
+            after: Only return activities started after this time
+            before: Only return activities started before this time
+            activity_types: Only return activities of these types (e.g., 'Ride', 'Run')
+            max_workers: Maximum number of parallel page fetches
 
         Returns:
             List of activities
         """
-        return list(self.client.get_activities(limit=limit))
+        types = set(activity_types) if activity_types else None
+        after = to_utc(after)
+        before = to_utc(before)
+
+        if limit is None:
+            activities = iter(self._get_all_activities(after, before, max_workers))
+        else:
+            # Strava returns activities oldest first if only 'after' is given
+            if after is not None and before is None:
+                before = datetime.now(UTC)
+            activities = iter(self.client.get_activities(before=before, after=after, limit=None if types else limit))
+
+        if types:
+            activities = (a for a in activities if type_name(a.type) in types or type_name(a.sport_type) in types)
+        return list(islice(activities, limit))
+
+    def _get_all_activities(
+        self, after: datetime | None, before: datetime | None, max_workers: int
+    ) -> list[SummaryActivity]:
+        """Fetch every page of a time window, with up to max_workers pages in flight.
+
+        The first page is fetched on its own, so a window that fits on one
+        page costs a single request. After that, pages are requested ahead
+        of the page being consumed and stop being requested at the first
+        short page, so at most max_workers - 1 requests more than sequential
+        paging are made.
+
+        Args:
+            after: Start of the window (aware UTC), or None
+            before: End of the window (aware UTC), or None
+            max_workers: Maximum number of pages in flight
+
+        Returns:
+            Activities in the window, most recent first
+        """
+        params = {
+            "after": int(after.timestamp()) if after else None,
+            "before": int(before.timestamp()) if before else None,
+        }
+
+        def fetch(page: int) -> list[SummaryActivity]:
+            raw = self.client.protocol.get("/athlete/activities", page=page, per_page=PAGE_SIZE, **params)
+            return [SummaryActivity.model_validate({**r, "bound_client": self.client}) for r in raw]
+
+        pages = [fetch(1)]
+        if len(pages[0]) == PAGE_SIZE:
+            # Refresh an expired token once up front instead of in every worker
+            # thread, which would all race to use the same refresh token.
+            protocol = self.client.protocol
+            if protocol.client_id and protocol.client_secret:
+                protocol.refresh_expired_token()
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending: deque[Future] = deque()
+                next_page = 2
+                while True:
+                    while len(pending) < max_workers:
+                        pending.append(executor.submit(fetch, next_page))
+                        next_page += 1
+                    page = pending.popleft().result()
+                    pages.append(page)
+                    if len(page) < PAGE_SIZE:
+                        for future in pending:
+                            future.cancel()
+                        break
+
+        # Activities uploaded while paging can shift an activity onto two pages
+        activities: dict[int, SummaryActivity] = {}
+        for page in pages:
+            for activity in page:
+                activities.setdefault(activity.id, activity)
+        return sorted(activities.values(), key=lambda a: a.start_date, reverse=True)
 
     def get_activity(self, activity_id: int) -> DetailedActivity:
         """Get a specific activity by ID.
@@ -89,6 +246,17 @@ class StravaClient:
 
         return gear_list
 
+    def get_gear(self, gear_id: str) -> DetailedGear:
+        """Get the details of a specific gear item.
+
+        Args:
+            gear_id: The gear ID
+
+        Returns:
+            Gear object
+        """
+        return self.client.get_gear(gear_id)
+
     def update_activity_gear(self, activity_id: int, gear_id: str) -> DetailedActivity:
         """Update the gear for a specific activity.
 
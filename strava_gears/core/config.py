@@ -4,48 +4,38 @@ import json
 import os
 from pathlib import Path
 
+from strava_gears.core.storage import Storage, open_storage
+
 
 class Config:
     """Manage application configuration."""
 
-    def __init__(self, config_dir: Path | None = None):
+    def __init__(self, config_dir: Path | None = None, storage: Storage | None = None):
         """Initialize configuration.
 
         Args:
             config_dir: Directory to store configuration files
+            storage: Storage backend (defaults to the backend selected by
+                STRAVA_GEARS_STORAGE, or SQLite in config_dir)
         """
         if config_dir is None:
             config_dir = Path.home() / ".config" / "strava-gears"
         self.config_dir = config_dir
         self.config_dir.mkdir(parents=True, exist_ok=True)
-        self.config_file = self.config_dir / "config.json"
-        self.token_file = self.config_dir / "tokens.json"
-        self._config = self._load_config()
-        self._tokens = self._load_tokens()
-
-    def _load_config(self) -> dict:
-        """Load configuration from file."""
-        if self.config_file.exists():
-            with open(self.config_file) as f:
-                return json.load(f)
-        return {}
-
-    def _save_config(self) -> None:
-        """Save configuration to file."""
-        with open(self.config_file, "w") as f:
-            json.dump(self._config, f, indent=2)
-
-    def _load_tokens(self) -> dict:
-        """Load tokens from file."""
-        if self.token_file.exists():
-            with open(self.token_file) as f:
-                return json.load(f)
-        return {}
-
-    def _save_tokens(self) -> None:
-        """Save tokens to file."""
-        with open(self.token_file, "w") as f:
-            json.dump(self._tokens, f, indent=2)
+        self.storage = storage or open_storage(None, self.config_dir)
+        self._migrate_json_file(self.config_dir / "config.json", "config")
+        self._migrate_json_file(self.config_dir / "tokens.json", "tokens")
+
+    def _migrate_json_file(self, path: Path, namespace: str) -> None:
+        """Import a legacy JSON file into storage if the namespace is empty."""
+        if not path.exists() or self.storage.items(namespace):
+            return
+        try:
+            with open(path) as f:
+                self.storage.set_many(namespace, json.load(f))
+            path.rename(path.with_suffix(".json.migrated"))
+        except FileNotFoundError:
+            pass  # Already migrated by a concurrent worker
 
     def get(self, key: str, default=None):
         """Get a configuration value.
@@ -57,7 +47,7 @@ class Config:
         Returns:
             Configuration value
         """
-        return self._config.get(key, default)
+        return self.storage.get("config", key, default)
 
     def set(self, key: str, value) -> None:
         """Set a configuration value.
@@ -66,8 +56,7 @@ class Config:
             key: Configuration key
             value: Value to set
         """
-        self._config[key] = value
-        self._save_config()
+        self.storage.set("config", key, value)
 
     def get_token(self, key: str, default=None):
         """Get a token value.
@@ -79,7 +68,7 @@ class Config:
         Returns:
             Token value
         """
-        return self._tokens.get(key, default)
+        return self.storage.get("tokens", key, default)
 
     def set_token(self, key: str, value) -> None:
         """Set a token value.
@@ -88,8 +77,7 @@ class Config:
             key: Token key
             value: Value to set
         """
-        self._tokens[key] = value
-        self._save_tokens()
+        self.storage.set("tokens", key, value)
 
     def get_client_credentials(self) -> tuple[str | None, str | None]:
         """Get Strava client credentials.
@@ -109,8 +97,7 @@ class Config:
             client_id: Strava client ID
             client_secret: Strava client secret
         """
-        self.set("client_id", client_id)
-        self.set("client_secret", client_secret)
+        self.storage.set_many("config", {"client_id": client_id, "client_secret": client_secret})
 
     def get_access_token(self) -> str | None:
         """Get Strava access token.
@@ -128,9 +115,9 @@ class Config:
             refresh_token: Refresh token
             expires_at: Token expiration timestamp
         """
-        self.set_token("access_token", access_token)
-        self.set_token("refresh_token", refresh_token)
-        self.set_token("expires_at", expires_at)
+        self.storage.set_many(
+            "tokens", {"access_token": access_token, "refresh_token": refresh_token, "expires_at": expires_at}
+        )
 
     def get_refresh_token(self) -> str | None:
         """Get Strava refresh token.
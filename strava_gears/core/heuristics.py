@@ -1,10 +1,27 @@
 """Heuristics for automatic gear assignment."""
 
+import time
 from collections.abc import Callable
 
 from stravalib.model import SummaryActivity
 
 
+def type_name(value) -> str | None:
+    """Get the plain name of an activity or sport type.
+
+    stravalib wraps types in root models whose str() is not the type name.
+
+    Args:
+        value: Activity type, sport type, plain string or None
+
+    Returns:
+        Type name (e.g., 'Ride'), or None if not set
+    """
+    if value is None:
+        return None
+    return str(getattr(value, "root", value))
+
+
 class GearRule:
     """Represents a rule for assigning gear to activities."""
 
@@ -32,12 +49,65 @@ class GearRule:
         return self.condition(activity)
 
 
+class RuleStats:
+    """Evaluation statistics for a single rule."""
+
+    def __init__(self, name: str):
+        """Initialize rule statistics.
+
+        Args:
+            name: Name of the rule
+        """
+        self.name = name
+        self.evaluations = 0
+        self.hits = 0
+        self.total_time = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of evaluations that matched."""
+        return self.hits / self.evaluations if self.evaluations else 0.0
+
+    @property
+    def mean_time(self) -> float:
+        """Mean evaluation time in seconds."""
+        return self.total_time / self.evaluations if self.evaluations else 0.0
+
+
+class RuleExplanation:
+    """Explains how the rules were evaluated for one activity."""
+
+    def __init__(self, activity: SummaryActivity, rule: GearRule | None, evaluated: list[GearRule]):
+        """Initialize an explanation.
+
+        Args:
+            activity: Evaluated activity
+            rule: Winning rule, or None if no rule matched
+            evaluated: Rules evaluated in order, including the winning rule
+        """
+        self.activity = activity
+        self.rule = rule
+        self.evaluated = evaluated
+
+    def __str__(self) -> str:
+        if self.rule is None:
+            return f"Activity {self.activity.id}: no match after {len(self.evaluated)} rules"
+        rejected = len(self.evaluated) - 1
+        return f"Activity {self.activity.id}: matched '{self.rule.name}' -> {self.rule.gear_id} ({rejected} rules rejected)"
+
+
 class GearAssigner:
     """Manages gear assignment rules and applies them to activities."""
 
-    def __init__(self):
-        """Initialize the gear assigner."""
+    def __init__(self, trace: bool = False):
+        """Initialize the gear assigner.
+
+        Args:
+            trace: Record per-rule statistics on every evaluation
+        """
         self.rules: list[GearRule] = []
+        self.trace = trace
+        self.stats: dict[GearRule, RuleStats] = {}
 
     def add_rule(self, rule: GearRule) -> None:
         """Add a gear assignment rule.
@@ -50,6 +120,7 @@ class GearAssigner:
     def clear_rules(self) -> None:
         """Clear all rules."""
         self.rules.clear()
+        self.stats.clear()
 
     def find_matching_gear(self, activity: SummaryActivity) -> str | None:
         """Find the first gear that matches the activity.
@@ -60,11 +131,82 @@ class GearAssigner:
         Returns:
             Gear ID if a match is found, None otherwise
         """
+        rule = self.find_matching_rule(activity)
+        return rule.gear_id if rule else None
+
+    def find_matching_rule(self, activity: SummaryActivity) -> GearRule | None:
+        """Find the first rule that matches the activity.
+
+        Args:
+            activity: Activity to match
+
+        Returns:
+            Matching rule if found, None otherwise
+        """
+        if self.trace:
+            return self.explain(activity).rule
         for rule in self.rules:
             if rule.matches(activity):
-                return rule.gear_id
+                return rule
         return None
 
+    def explain(self, activity: SummaryActivity) -> RuleExplanation:
+        """Evaluate the rules for an activity, recording statistics.
+
+        Args:
+            activity: Activity to match
+
+        Returns:
+            Explanation of the winning rule and the rules evaluated before it
+        """
+        evaluated = []
+        for rule in self.rules:
+            stats = self.stats.get(rule)
+            if stats is None:
+                stats = self.stats[rule] = RuleStats(rule.name)
+            start = time.perf_counter()
+            matched = rule.matches(activity)
+            stats.total_time += time.perf_counter() - start
+            stats.evaluations += 1
+            evaluated.append(rule)
+            if matched:
+                stats.hits += 1
+                return RuleExplanation(activity, rule, evaluated)
+        return RuleExplanation(activity, None, evaluated)
+
+    def get_stats(self) -> list[RuleStats]:
+        """Get the recorded statistics in rule order.
+
+        Returns:
+            List of statistics, one per rule
+        """
+        return [self.stats.get(rule) or RuleStats(rule.name) for rule in self.rules]
+
+    def optimize_order(self) -> None:
+        """Reorder rules so hot and cheap rules are evaluated first.
+
+        Only consecutive rules assigning the same gear are reordered among
+        each other, so the assigned gear never changes for any activity.
+        Within such a run, rules are sorted by mean cost per hit based on
+        the recorded statistics; rules that never matched go last.
+        """
+
+        def cost(rule: GearRule) -> float:
+            stats = self.stats.get(rule)
+            if stats is None or not stats.hits:
+                return float("inf")
+            return stats.mean_time / stats.hit_rate
+
+        ordered: list[GearRule] = []
+        run: list[GearRule] = []
+        for rule in self.rules:
+            if run and rule.gear_id != run[0].gear_id:
+                ordered.extend(sorted(run, key=cost))
+                run = []
+            run.append(rule)
+        ordered.extend(sorted(run, key=cost))
+        self.rules = ordered
+
 
 def create_activity_type_rule(activity_type: str, gear_id: str, name: str | None = None) -> GearRule:
     """Create a rule that matches activities by type.
@@ -79,7 +221,7 @@ def create_activity_type_rule(activity_type: str, gear_id: str, name: str | None
     """
     if name is None:
         name = f"Type: {activity_type}"
-    return GearRule(name, lambda a: str(a.type) == activity_type, gear_id)
+    return GearRule(name, lambda a: type_name(a.type) == activity_type, gear_id)
 
 
 def create_distance_rule(
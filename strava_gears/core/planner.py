@@ -0,0 +1,189 @@
+"""Diff-based planning of gear assignments."""
+
+import json
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from stravalib.model import SummaryActivity
+
+from strava_gears.core.client import StravaClient
+from strava_gears.core.heuristics import GearAssigner, RuleExplanation
+
+
+class GearChange:
+    """A single planned gear change for an activity."""
+
+    def __init__(
+        self,
+        activity_id: int,
+        activity_name: str | None,
+        old_gear_id: str | None,
+        new_gear_id: str,
+        rule_name: str,
+    ):
+        """Initialize a gear change.
+
+        Args:
+            activity_id: ID of the activity to update
+            activity_name: Name of the activity (for display)
+            old_gear_id: Gear ID currently assigned to the activity
+            new_gear_id: Gear ID to assign
+            rule_name: Name of the rule that produced this change
+        """
+        self.activity_id = activity_id
+        self.activity_name = activity_name
+        self.old_gear_id = old_gear_id
+        self.new_gear_id = new_gear_id
+        self.rule_name = rule_name
+
+    def to_dict(self) -> dict:
+        """Convert the change to a JSON-serializable dict.
+
+        Returns:
+            Dict representation of the change
+        """
+        return {
+            "activity_id": self.activity_id,
+            "activity_name": self.activity_name,
+            "old_gear_id": self.old_gear_id,
+            "new_gear_id": self.new_gear_id,
+            "rule_name": self.rule_name,
+        }
+
+
+class GearPlan:
+    """A minimal set of gear changes, grouped by the rule that produced them."""
+
+    def __init__(self, changes: list[GearChange] | None = None, explanations: list[RuleExplanation] | None = None):
+        """Initialize a gear plan.
+
+        Args:
+            changes: Planned changes
+            explanations: Rule explanations for every evaluated activity (only
+                collected when the assigner traces)
+        """
+        self.changes: list[GearChange] = changes or []
+        self.explanations: list[RuleExplanation] = explanations or []
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def by_rule(self) -> dict[str, list[GearChange]]:
+        """Group the planned changes by rule name.
+
+        Returns:
+            Mapping of rule name to its changes, ordered by each rule's first change
+        """
+        groups: dict[str, list[GearChange]] = {}
+        for change in self.changes:
+            groups.setdefault(change.rule_name, []).append(change)
+        return groups
+
+    def to_dict(self) -> dict:
+        """Convert the plan to a JSON-serializable dict.
+
+        Returns:
+            Dict representation of the plan
+        """
+        return {"changes": [change.to_dict() for change in self.changes]}
+
+    def export(self, path: Path) -> None:
+        """Write the plan to a JSON file.
+
+        Args:
+            path: File to write the plan to
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: Path) -> "GearPlan":
+        """Load a plan previously written with `export`.
+
+        Args:
+            path: File to read the plan from
+
+        Returns:
+            GearPlan instance
+        """
+        with open(path) as f:
+            data = json.load(f)
+        return cls([GearChange(**change) for change in data.get("changes", [])])
+
+    def execute(
+        self,
+        client: StravaClient,
+        on_change: Callable[[GearChange], None] | None = None,
+        on_skip: Callable[[GearChange], None] | None = None,
+        verify: bool = False,
+    ) -> int:
+        """Apply the plan, issuing one write per planned change.
+
+        Args:
+            client: Strava client used for the updates
+            on_change: Optional callback invoked after each applied change
+            on_skip: Optional callback invoked for each change skipped as stale
+            verify: Fetch each activity first and skip the change if its gear
+                no longer matches the planned old gear (e.g. for a loaded plan)
+
+        Returns:
+            Number of activities updated
+        """
+        updated = 0
+        for change in self.changes:
+            if verify and client.get_activity(change.activity_id).gear_id != change.old_gear_id:
+                if on_skip is not None:
+                    on_skip(change)
+                continue
+            client.update_activity_gear(change.activity_id, change.new_gear_id)
+            updated += 1
+            if on_change is not None:
+                on_change(change)
+        return updated
+
+
+class GearPlanner:
+    """Evaluate rules over activities to produce a gear plan."""
+
+    def __init__(self, assigner: GearAssigner):
+        """Initialize the planner.
+
+        Args:
+            assigner: Gear assigner holding the rules to evaluate
+        """
+        self.assigner = assigner
+
+    def plan(self, activities: Iterable[SummaryActivity]) -> GearPlan:
+        """Compute the minimal set of gear changes for the given activities.
+
+        Activities are only included if a rule matches and the matched gear
+        differs from the gear already assigned. No API calls are made. If the
+        assigner traces, the plan also holds an explanation per activity.
+
+        Args:
+            activities: Activities to evaluate
+
+        Returns:
+            GearPlan with the necessary changes
+        """
+        changes: list[GearChange] = []
+        explanations: list[RuleExplanation] = []
+        seen: set[int] = set()
+        for activity in activities:
+            if activity.id in seen:
+                continue
+            seen.add(activity.id)
+
+            if self.assigner.trace:
+                explanation = self.assigner.explain(activity)
+                explanations.append(explanation)
+                rule = explanation.rule
+            else:
+                rule = self.assigner.find_matching_rule(activity)
+            if rule is None or rule.gear_id == activity.gear_id:
+                continue
+            changes.append(GearChange(activity.id, activity.name, activity.gear_id, rule.gear_id, rule.name))
+        return GearPlan(changes, explanations)
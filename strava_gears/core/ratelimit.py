@@ -0,0 +1,103 @@
+"""Rate limiting shared between workers through a storage backend."""
+
+import time
+from collections.abc import Callable
+from typing import Literal
+
+from stravalib.util.limiter import RateLimiter, RequestRate, SleepingRateLimitRule, get_rates_from_response_headers
+
+from strava_gears.core.storage import Storage
+
+SHORT_PERIOD = 15 * 60
+LONG_PERIOD = 24 * 60 * 60
+
+
+class SharedRateLimitRule(SleepingRateLimitRule):
+    """Sleeping rate limit rule that merges the usage seen by all workers.
+
+    Strava reports the application's usage in the headers of every response.
+    Each response's rates are stored, and the highest usage reported by any
+    worker within the current 15-minute and daily periods is used to decide
+    how long to wait, so a worker stops as soon as any other worker has seen
+    the limit being reached.
+    """
+
+    def __init__(
+        self,
+        storage: Storage,
+        priority: Literal["low", "medium", "high"] = "high",
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the rule.
+
+        Args:
+            storage: Storage shared by all workers
+            priority: Throttling priority, see SleepingRateLimitRule
+            sleep: Function used to wait
+            clock: Function returning the current epoch time
+        """
+        super().__init__(priority=priority)
+        self.storage = storage
+        self._sleep = sleep
+        self._clock = clock
+
+    def _merge(self, rates: RequestRate | None, now: float) -> RequestRate | None:
+        """Merge the observed rates into storage and return the shared rates."""
+        short_window = int(now // SHORT_PERIOD)
+        long_window = int(now // LONG_PERIOD)
+        stored = self.storage.get("ratelimit", "rates")
+        if stored and stored["long_window"] != long_window:
+            stored = None
+        if stored and stored["short_window"] != short_window:
+            stored = {**stored, "short_window": short_window, "short_usage": 0}
+
+        if rates is not None:
+            if stored is None:
+                stored = {"short_window": short_window, "long_window": long_window}
+            # Usage only grows within a period, so the maximum is the most
+            # recent observation even if workers write concurrently.
+            stored = {
+                **stored,
+                "short_usage": max(stored.get("short_usage", 0), rates.short_usage),
+                "long_usage": max(stored.get("long_usage", 0), rates.long_usage),
+                "short_limit": rates.short_limit,
+                "long_limit": rates.long_limit,
+            }
+            self.storage.set("ratelimit", "rates", stored)
+
+        if stored is None or "short_limit" not in stored:
+            return None
+        return RequestRate(
+            short_usage=stored["short_usage"],
+            long_usage=stored["long_usage"],
+            short_limit=stored["short_limit"],
+            long_limit=stored["long_limit"],
+        )
+
+    def __call__(self, response_headers: dict[str, str], method) -> None:
+        now = self._clock()
+        rates = self._merge(get_rates_from_response_headers(response_headers, method), now)
+        if rates is None:
+            return
+        wait = self._get_wait_time(
+            rates,
+            SHORT_PERIOD - int(now % SHORT_PERIOD),
+            LONG_PERIOD - int(now % LONG_PERIOD),
+        )
+        if wait:
+            self._sleep(wait)
+
+
+class SharedRateLimiter(RateLimiter):
+    """Rate limiter whose state is shared by all workers using the same storage."""
+
+    def __init__(self, storage: Storage, priority: Literal["low", "medium", "high"] = "high"):
+        """Initialize the rate limiter.
+
+        Args:
+            storage: Storage shared by all workers
+            priority: Throttling priority; 'high' only waits once a limit is reached
+        """
+        super().__init__()
+        self.rules.append(SharedRateLimitRule(storage, priority=priority))
@@ -0,0 +1,237 @@
+"""Record and replay Strava API responses using a local fixture archive."""
+
+import gzip
+import json
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from stravalib.client import Client
+from stravalib.protocol import ApiV3
+
+API_PREFIX = "/api/v3"
+
+
+def _api_path(url: str) -> str:
+    """Get the API path of a request URL (e.g., '/athlete/activities')."""
+    path = urlparse(url).path
+    return path.removeprefix(API_PREFIX).rstrip("/")
+
+
+def _start_timestamp(activity: dict) -> float:
+    """Get the start time of a raw activity as an epoch timestamp."""
+    return datetime.fromisoformat(activity["start_date"].replace("Z", "+00:00")).timestamp()
+
+
+class FixtureArchive:
+    """Raw athlete, gear and activity responses stored in a gzip-compressed JSON file."""
+
+    def __init__(self):
+        """Initialize an empty archive."""
+        self.athlete: dict | None = None
+        self.gear: dict[str, dict] = {}
+        self.activities: dict[str, dict] = {}
+        self.activity_details: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        # Activities sorted by start time, with their timestamps; rebuilt lazily
+        self._sorted: list[dict] | None = None
+        self._timestamps: list[float] = []
+
+    @classmethod
+    def load(cls, path: Path) -> "FixtureArchive":
+        """Load an archive from disk.
+
+        Args:
+            path: Archive file
+
+        Returns:
+            FixtureArchive instance
+        """
+        archive = cls()
+        with gzip.open(path, "rt") as f:
+            data = json.load(f)
+        archive.athlete = data.get("athlete")
+        archive.gear = data.get("gear", {})
+        archive.activities = data.get("activities", {})
+        archive.activity_details = data.get("activity_details", {})
+        return archive
+
+    def save(self, path: Path) -> None:
+        """Write the archive to disk.
+
+        Args:
+            path: Archive file
+        """
+        with self._lock:
+            data = {
+                "athlete": self.athlete,
+                "gear": self.gear,
+                "activities": self.activities,
+                "activity_details": self.activity_details,
+            }
+        with gzip.open(path, "wt") as f:
+            json.dump(data, f)
+
+    def record(self, method: str, url: str, body) -> None:
+        """Store the body of a successful API response.
+
+        Args:
+            method: HTTP method of the request
+            url: Request URL
+            body: Decoded JSON response body
+        """
+        path = _api_path(url)
+        parts = path.strip("/").split("/")
+        with self._lock:
+            if path == "/athlete":
+                self.athlete = body
+            elif path == "/athlete/activities":
+                for activity in body:
+                    self.activities[str(activity["id"])] = activity
+                self._sorted = None
+            elif len(parts) == 2 and parts[0] == "activities":
+                self.activity_details[parts[1]] = body
+                if method == "PUT":
+                    self.activities[parts[1]] = body
+                    self._sorted = None
+            elif len(parts) == 2 and parts[0] == "gear":
+                self.gear[parts[1]] = body
+
+    def list_activities(self, params: dict) -> list[dict]:
+        """Serve a page of the activity list the way the Strava API does.
+
+        Args:
+            params: Query parameters (before, after, page, per_page)
+
+        Returns:
+            Raw activities on the requested page
+        """
+        with self._lock:
+            if self._sorted is None:
+                keyed = sorted((_start_timestamp(a), a["id"], a) for a in self.activities.values())
+                self._timestamps = [timestamp for timestamp, _, _ in keyed]
+                self._sorted = [activity for _, _, activity in keyed]
+            activities, timestamps = self._sorted, self._timestamps
+
+        before = params.get("before")
+        after = params.get("after")
+        # Both bounds are exclusive
+        lo = bisect_right(timestamps, float(after)) if after is not None else 0
+        hi = bisect_left(timestamps, float(before)) if before is not None else len(timestamps)
+
+        page = int(params.get("page") or 1)
+        per_page = int(params.get("per_page") or 30)
+        offset = (page - 1) * per_page
+        # Strava returns ascending order when only 'after' is given
+        if after is not None and before is None:
+            return activities[lo + offset : min(lo + offset + per_page, hi)]
+        end = hi - offset
+        if end <= lo:
+            return []
+        return activities[max(end - per_page, lo) : end][::-1]
+
+    def serve(self, method: str, url: str, params: dict):
+        """Look up the response body for a request.
+
+        Args:
+            method: HTTP method of the request
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            Decoded JSON response body, or None if it is not in the archive
+        """
+        if method != "GET":
+            raise ValueError(f"Replay archives are read-only, cannot {method} {url}")
+
+        path = _api_path(url)
+        parts = path.strip("/").split("/")
+        if path == "/athlete":
+            return self.athlete
+        if path == "/athlete/activities":
+            return self.list_activities(params)
+        if len(parts) == 2 and parts[0] == "activities":
+            return self.activity_details.get(parts[1]) or self.activities.get(parts[1])
+        if len(parts) == 2 and parts[0] == "gear":
+            return self.gear.get(parts[1])
+        return None
+
+
+class RecordingSession(requests.Session):
+    """Requests session that stores API responses in a fixture archive."""
+
+    def __init__(self, archive: FixtureArchive):
+        """Initialize the recording session.
+
+        Args:
+            archive: Archive to record responses into
+        """
+        super().__init__()
+        self.archive = archive
+
+    def request(self, method, url, *args, **kwargs):
+        response = super().request(method, url, *args, **kwargs)
+        if response.ok and response.content:
+            self.archive.record(method.upper(), url, response.json())
+        return response
+
+
+class ReplaySession(requests.Session):
+    """Requests session that serves API responses from a fixture archive without network access."""
+
+    def __init__(self, archive: FixtureArchive):
+        """Initialize the replay session.
+
+        Args:
+            archive: Archive to serve responses from
+        """
+        super().__init__()
+        self.archive = archive
+
+    def request(self, method, url, params=None, *args, **kwargs):
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        body = self.archive.serve(method.upper(), url, params)
+
+        response = requests.Response()
+        response.url = url
+        response.headers["Content-Type"] = "application/json"
+        # Report an unused rate limit so stravalib's limiter has rates to read
+        response.headers["X-RateLimit-Limit"] = "600,30000"
+        response.headers["X-RateLimit-Usage"] = "0,0"
+        if body is None:
+            response.status_code = 404
+            response.reason = "Not Found"
+            body = {"message": "Record Not Found", "errors": [{"resource": _api_path(url), "code": "not found"}]}
+        else:
+            response.status_code = 200
+            response.reason = "OK"
+        response._content = json.dumps(body).encode()
+        return response
+
+
+class _ReplayApi(ApiV3):
+    """Strava protocol for replay, which needs no credentials or token refresh."""
+
+    def _check_credentials(self) -> None:
+        # Leave client_id/client_secret unset so tokens are never refreshed,
+        # and skip the warnings about them missing from the environment.
+        pass
+
+
+class ReplayClient(Client):
+    """stravalib client that serves all requests from a fixture archive."""
+
+    def __init__(self, archive: FixtureArchive):
+        """Initialize the replay client.
+
+        Args:
+            archive: Archive to serve responses from
+        """
+        # Client.__init__ only sets up the logger and protocol; build the
+        # protocol directly so stravalib's credential check is not run.
+        self.log = logging.getLogger(f"{self.__class__.__module__}.{self.__class__.__name__}")
+        self.protocol = _ReplayApi(requests_session=ReplaySession(archive))
@@ -0,0 +1,190 @@
+"""Storage backends for persistent state (configuration, tokens, caches)."""
+
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from urllib.parse import urlparse
+
+
+class Storage(ABC):
+    """Namespaced key-value store with JSON-serializable values."""
+
+    @abstractmethod
+    def get(self, namespace: str, key: str, default=None):
+        """Get a value.
+
+        Args:
+            namespace: Namespace of the key (e.g., 'config', 'tokens')
+            key: Key to look up
+            default: Default value if key not found
+
+        Returns:
+            Stored value
+        """
+
+    @abstractmethod
+    def set_many(self, namespace: str, values: dict) -> None:
+        """Atomically set several values in a namespace.
+
+        Args:
+            namespace: Namespace of the keys
+            values: Mapping of keys to values
+        """
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        """Delete a value if it exists.
+
+        Args:
+            namespace: Namespace of the key
+            key: Key to delete
+        """
+
+    @abstractmethod
+    def items(self, namespace: str) -> dict:
+        """Get all values in a namespace.
+
+        Args:
+            namespace: Namespace to read
+
+        Returns:
+            Mapping of keys to values
+        """
+
+    def set(self, namespace: str, key: str, value) -> None:
+        """Set a value.
+
+        Args:
+            namespace: Namespace of the key
+            key: Key to set
+            value: Value to set
+        """
+        self.set_many(namespace, {key: value})
+
+
+class SQLiteStorage(Storage):
+    """Embedded storage in a SQLite database using WAL mode.
+
+    WAL mode allows concurrent readers alongside a single writer, so several
+    worker processes on one host can share the same database file.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize SQLite storage.
+
+        Args:
+            path: Database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+
+    def get(self, namespace: str, key: str, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_many(self, namespace: str, values: dict) -> None:
+        rows = [(namespace, key, json.dumps(value)) for key, value in values.items()]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO kv (namespace, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value",
+                    rows,
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def items(self, namespace: str) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM kv WHERE namespace = ?", (namespace,)).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+
+class RedisStorage(Storage):
+    """Storage in a Redis-compatible server, shared across hosts.
+
+    Each namespace is stored as a hash under ``<prefix>:<namespace>``.
+    Requires the optional ``redis`` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "strava-gears", client=None):
+        """Initialize Redis storage.
+
+        Args:
+            url: Redis connection URL (e.g., 'redis://localhost:6379/0')
+            prefix: Prefix for all keys
+            client: Existing Redis-compatible client to use instead of connecting to url
+        """
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError("Redis storage requires the 'redis' package: pip install strava-gears[redis]") from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}"
+
+    def get(self, namespace: str, key: str, default=None):
+        value = self.client.hget(self._key(namespace), key)
+        return json.loads(value) if value is not None else default
+
+    def set_many(self, namespace: str, values: dict) -> None:
+        if values:
+            self.client.hset(self._key(namespace), mapping={key: json.dumps(value) for key, value in values.items()})
+
+    def delete(self, namespace: str, key: str) -> None:
+        self.client.hdel(self._key(namespace), key)
+
+    def items(self, namespace: str) -> dict:
+        values = self.client.hgetall(self._key(namespace))
+        return {(key.decode() if isinstance(key, bytes) else key): json.loads(value) for key, value in values.items()}
+
+
+def open_storage(url: str | None, config_dir: Path) -> Storage:
+    """Open a storage backend from a URL.
+
+    Supported URLs are ``sqlite:///path/to/file.db`` and ``redis://...``
+    (or ``rediss://...``). If no URL is given, the ``STRAVA_GEARS_STORAGE``
+    environment variable is used, falling back to a SQLite database in
+    config_dir.
+
+    Args:
+        url: Storage URL
+        config_dir: Directory for the default SQLite database
+
+    Returns:
+        Storage instance
+    """
+    url = url or os.getenv("STRAVA_GEARS_STORAGE")
+    if not url:
+        return SQLiteStorage(config_dir / "strava-gears.db")
+
+    scheme = urlparse(url).scheme
+    if scheme == "sqlite":
+        return SQLiteStorage(Path(url.removeprefix("sqlite://")))
+    if scheme in ("redis", "rediss"):
+        return RedisStorage(url)
+    raise ValueError(f"Unsupported storage URL: {url}")
@@ -0,0 +1,41 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from strava_gears.core.storage import RedisStorage, SQLiteStorage
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the Redis hash commands used by RedisStorage.
+
+    Like redis-py without decode_responses, values are returned as bytes.
+    """
+
+    def __init__(self):
+        self.data: dict[str, dict[bytes, bytes]] = {}
+
+    def hget(self, name, key):
+        return self.data.get(name, {}).get(key.encode())
+
+    def hset(self, name, mapping):
+        self.data.setdefault(name, {}).update({k.encode(): v.encode() for k, v in mapping.items()})
+
+    def hdel(self, name, key):
+        self.data.get(name, {}).pop(key.encode(), None)
+
+    def hgetall(self, name):
+        return dict(self.data.get(name, {}))
+
+
+@pytest.fixture
+def fake_redis():
+    """An empty fake Redis client."""
+    return FakeRedis()
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def storage(request, tmp_path, fake_redis):
+    """Each storage backend, empty."""
+    if request.param == "sqlite":
+        return SQLiteStorage(tmp_path / "test.db")
+    return RedisStorage("", client=fake_redis)
@@ -0,0 +1,28 @@
+"""Tests for the command-line interface."""
+
+import click
+from click.testing import CliRunner
+
+from strava_gears.cli.common import get_client
+from strava_gears.core.config import Config
+
+
+def test_refreshed_tokens_are_saved(tmp_path, storage):
+    config = Config(tmp_path, storage=storage)
+    config.set_access_token("old-access", "old-refresh", 1)
+
+    @click.command()
+    @click.pass_context
+    def command(ctx):
+        client = get_client(ctx)
+        # Simulate stravalib refreshing the token during the command
+        client.client.access_token = "new-access"
+        client.client.refresh_token = "new-refresh"
+        client.client.token_expires = 2
+
+    result = CliRunner().invoke(command, obj={"config": config})
+
+    assert result.exit_code == 0, result.output
+    assert config.get_access_token() == "new-access"
+    assert config.get_refresh_token() == "new-refresh"
+    assert config.get_expires_at() == 2
@@ -0,0 +1,143 @@
+"""Tests for the Strava API client."""
+
+import time
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+
+from strava_gears.core.client import PAGE_SIZE, StravaClient, to_utc
+from strava_gears.core.replay import FixtureArchive, ReplaySession
+
+START = datetime(2024, 1, 1, 8, tzinfo=UTC)
+
+
+def make_activity(activity_id, start, activity_type="Ride"):
+    return {
+        "id": activity_id,
+        "name": f"Activity {activity_id}",
+        "type": activity_type,
+        "sport_type": activity_type,
+        "start_date": start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+class CountingSession(ReplaySession):
+    """Replay session that records the query parameters of every request."""
+
+    def __init__(self, archive):
+        super().__init__(archive)
+        self.requests = []
+
+    def request(self, method, url, params=None, *args, **kwargs):
+        self.requests.append(dict(params or {}))
+        return super().request(method, url, params, *args, **kwargs)
+
+
+def make_client(activities):
+    archive = FixtureArchive()
+    archive.activities = {str(a["id"]): a for a in activities}
+    session = CountingSession(archive)
+    return StravaClient("token", requests_session=session), session
+
+
+def daily(count, activity_type=lambda i: "Ride"):
+    return [make_activity(i, START + timedelta(days=i), activity_type(i)) for i in range(1, count + 1)]
+
+
+@pytest.fixture
+def los_angeles(monkeypatch):
+    """Run with a local timezone west of UTC."""
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_to_utc():
+    assert to_utc(None) is None
+    assert to_utc(datetime(2024, 1, 1, 8)) == START
+    assert to_utc(datetime(2024, 1, 1, 9, tzinfo=timezone(timedelta(hours=1)))) == START
+    assert to_utc(datetime(2024, 1, 1, 8)).tzinfo is UTC
+
+
+def test_recent_activity_returned_west_of_utc(los_angeles):
+    recent = make_activity(1, datetime.now(UTC) - timedelta(hours=1))
+    client, _ = make_client([make_activity(2, START), recent])
+
+    assert [a.id for a in client.get_activities(limit=None, after=datetime(2023, 12, 1))] == [1, 2]
+    assert [a.id for a in client.get_activities(limit=5, after=datetime(2023, 12, 1))] == [1, 2]
+
+
+def test_aware_after_without_before():
+    client, _ = make_client(daily(5))
+    after = datetime(2024, 1, 3, 9, tzinfo=timezone(timedelta(hours=1)))
+
+    # 09:00 at UTC+1 is activity 2's start time, and the bound is exclusive
+    assert [a.id for a in client.get_activities(limit=None, after=after)] == [5, 4, 3]
+    assert [a.id for a in client.get_activities(limit=2, after=after)] == [5, 4]
+
+
+def test_limit_is_a_single_request():
+    client, session = make_client(daily(50))
+
+    assert [a.id for a in client.get_activities(limit=5)] == [50, 49, 48, 47, 46]
+    assert len(session.requests) == 1
+
+
+def test_limit_with_window_returns_newest_first():
+    client, session = make_client(daily(50))
+
+    activities = client.get_activities(limit=3, after=START + timedelta(days=10), before=START + timedelta(days=20))
+
+    assert [a.id for a in activities] == [19, 18, 17]
+    assert len(session.requests) == 1
+
+
+def test_type_filter():
+    client, _ = make_client(daily(20, lambda i: "Run" if i % 2 else "Ride"))
+
+    assert [a.id for a in client.get_activities(limit=3, activity_types=["Run"])] == [19, 17, 15]
+    assert len(client.get_activities(limit=None, activity_types=["Ride"])) == 10
+    assert client.get_activities(limit=None, activity_types=["Swim"]) == []
+
+
+def test_window_on_one_page_is_a_single_request():
+    client, session = make_client(daily(50))
+
+    activities = client.get_activities(limit=None, after=START + timedelta(days=10))
+
+    assert [a.id for a in activities] == list(range(50, 10, -1))
+    assert len(session.requests) == 1
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_all_pages_fetched_newest_first(max_workers):
+    client, session = make_client(daily(2 * PAGE_SIZE + 50))
+
+    activities = client.get_activities(limit=None, max_workers=max_workers)
+
+    assert [a.id for a in activities] == list(range(2 * PAGE_SIZE + 50, 0, -1))
+    # Sequential paging needs 3 requests; at most max_workers - 1 pages are requested ahead
+    assert 3 <= len(session.requests) <= 3 + max_workers - 1
+    if max_workers == 1:
+        assert [r["page"] for r in session.requests] == [1, 2, 3]
+
+
+def test_activities_on_two_pages_are_deduplicated():
+    client, session = make_client(daily(PAGE_SIZE + 10))
+    archive = session.archive
+    list_activities = archive.list_activities
+
+    def shifting_list_activities(params):
+        # Simulate an upload between page requests: page 2 repeats the last activity of page 1
+        page = list_activities(params)
+        if int(params.get("page", 1)) == 2:
+            page = list_activities({**params, "page": 1})[-1:] + page
+        return page
+
+    archive.list_activities = shifting_list_activities
+
+    activities = client.get_activities(limit=None)
+
+    assert [a.id for a in activities] == list(range(PAGE_SIZE + 10, 0, -1))
@@ -0,0 +1,72 @@
+"""Tests for configuration management."""
+
+import json
+
+from strava_gears.core.config import Config
+from strava_gears.core.storage import SQLiteStorage
+
+
+def test_tokens_round_trip(tmp_path, storage):
+    config = Config(tmp_path, storage=storage)
+    config.set_access_token("access", "refresh", 1700000000)
+    assert config.get_access_token() == "access"
+    assert config.get_refresh_token() == "refresh"
+    assert config.get_expires_at() == 1700000000
+
+
+def test_client_credentials(tmp_path, storage, monkeypatch):
+    monkeypatch.delenv("STRAVA_CLIENT_ID", raising=False)
+    monkeypatch.delenv("STRAVA_CLIENT_SECRET", raising=False)
+    config = Config(tmp_path, storage=storage)
+    config.set_client_credentials("id", "secret")
+    assert config.get_client_credentials() == ("id", "secret")
+
+
+def test_default_storage_is_sqlite(tmp_path, monkeypatch):
+    monkeypatch.delenv("STRAVA_GEARS_STORAGE", raising=False)
+    Config(tmp_path).set("client_id", "123")
+    assert isinstance(Config(tmp_path).storage, SQLiteStorage)
+    assert Config(tmp_path).get("client_id") == "123"
+
+
+def test_migrates_legacy_json_files(tmp_path, storage):
+    (tmp_path / "config.json").write_text(json.dumps({"client_id": "123", "client_secret": "secret"}))
+    (tmp_path / "tokens.json").write_text(json.dumps({"access_token": "a", "refresh_token": "r", "expires_at": 5}))
+
+    config = Config(tmp_path, storage=storage)
+
+    assert config.get("client_id") == "123"
+    assert config.get_access_token() == "a"
+    assert config.get_expires_at() == 5
+    assert not (tmp_path / "config.json").exists()
+    assert not (tmp_path / "tokens.json").exists()
+    assert (tmp_path / "config.json.migrated").exists()
+    assert (tmp_path / "tokens.json.migrated").exists()
+
+
+def test_migration_does_not_overwrite_storage(tmp_path, storage):
+    storage.set("tokens", "access_token", "current")
+    (tmp_path / "tokens.json").write_text(json.dumps({"access_token": "stale"}))
+
+    config = Config(tmp_path, storage=storage)
+
+    assert config.get_access_token() == "current"
+    assert (tmp_path / "tokens.json").exists()
+
+
+def test_migration_tolerates_concurrent_worker(tmp_path, storage, monkeypatch):
+    (tmp_path / "tokens.json").write_text(json.dumps({"access_token": "a"}))
+
+    # Simulate another worker migrating the file between the exists() check and open()
+    real_open = open
+
+    def racing_open(path, *args, **kwargs):
+        if str(path).endswith("tokens.json"):
+            (tmp_path / "tokens.json").rename(tmp_path / "tokens.json.migrated")
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", racing_open)
+    config = Config(tmp_path, storage=storage)
+
+    assert config.get_access_token() is None
+    assert (tmp_path / "tokens.json.migrated").exists()
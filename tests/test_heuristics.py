@@ -0,0 +1,126 @@
+"""Tests for gear assignment heuristics."""
+
+from stravalib.model import SummaryActivity
+
+from strava_gears.core.heuristics import (
+    GearAssigner,
+    GearRule,
+    RuleStats,
+    create_activity_type_rule,
+    create_distance_rule,
+    create_name_pattern_rule,
+)
+from strava_gears.core.planner import GearPlanner
+
+
+def make_activity(activity_id, activity_type="Ride", name="", distance=10000.0, gear_id=None):
+    return SummaryActivity.model_validate(
+        {
+            "id": activity_id,
+            "name": name,
+            "type": activity_type,
+            "sport_type": activity_type,
+            "distance": distance,
+            "gear_id": gear_id,
+        }
+    )
+
+
+ACTIVITIES = [
+    make_activity(1, "Ride", "Morning commute", 8000),
+    make_activity(2, "Ride", "Long ride", 120000),
+    make_activity(3, "Ride", "Gravel loop", 45000),
+    make_activity(4, "Run", "Evening run", 10000),
+    make_activity(5, "Run", "Trail run", 21000),
+    make_activity(6, "Swim", "Pool", 2000),
+    make_activity(7, "Ride", "Commute home", 9000),
+    make_activity(8, "Ride", "Recovery spin", 20000),
+]
+
+
+def make_assigner():
+    assigner = GearAssigner(trace=True)
+    # Rules for the same gear are consecutive, with a never-matching rule first
+    assigner.add_rule(create_name_pattern_rule("unicycle", "commuter"))
+    assigner.add_rule(create_name_pattern_rule("commute", "commuter"))
+    assigner.add_rule(create_distance_rule(min_distance=100000, gear_id="road"))
+    assigner.add_rule(create_name_pattern_rule("tandem", "road"))
+    assigner.add_rule(create_activity_type_rule("Ride", "road"))
+    assigner.add_rule(create_activity_type_rule("Run", "shoes"))
+    return assigner
+
+
+def test_activity_type_rule_matches_stravalib_types():
+    rule = create_activity_type_rule("Ride", "road")
+    assert rule.matches(make_activity(1, "Ride"))
+    assert not rule.matches(make_activity(2, "Run"))
+
+
+def test_explain():
+    assigner = make_assigner()
+    explanation = assigner.explain(ACTIVITIES[2])
+    assert explanation.rule.name == "Type: Ride"
+    assert [rule.name for rule in explanation.evaluated][-1] == "Type: Ride"
+    assert len(explanation.evaluated) == 5
+
+    explanation = assigner.explain(ACTIVITIES[5])
+    assert explanation.rule is None
+    assert len(explanation.evaluated) == len(assigner.rules)
+
+
+def test_stats_recorded_during_planning():
+    assigner = make_assigner()
+    plan = GearPlanner(assigner).plan(ACTIVITIES)
+
+    assert len(plan.explanations) == len(ACTIVITIES)
+    stats = {s.name: s for s in assigner.get_stats()}
+    assert stats["Name contains: unicycle"].evaluations == len(ACTIVITIES)
+    assert stats["Name contains: unicycle"].hits == 0
+    assert stats["Name contains: commute"].hits == 2
+    assert stats["Distance: 100000-inf"].hits == 1
+    assert stats["Type: Ride"].hits == 2
+    assert stats["Type: Run"].hits == 2
+    assert all(s.total_time >= 0 for s in stats.values())
+
+
+def test_optimize_order_keeps_assigned_gear():
+    assigner = make_assigner()
+    before = {activity.id: assigner.find_matching_gear(activity) for activity in ACTIVITIES}
+
+    assigner.optimize_order()
+
+    assert {activity.id: assigner.find_matching_gear(activity) for activity in ACTIVITIES} == before
+
+
+def test_optimize_order_puts_rules_without_hits_last():
+    assigner = make_assigner()
+    for activity in ACTIVITIES:
+        assigner.explain(activity)
+
+    assigner.optimize_order()
+
+    names = [rule.name for rule in assigner.rules]
+    assert names[:2] == ["Name contains: commute", "Name contains: unicycle"]
+    assert set(names[2:5]) == {"Distance: 100000-inf", "Name contains: tandem", "Type: Ride"}
+    assert names[4] == "Name contains: tandem"
+    assert names[5] == "Type: Run"
+
+
+def test_optimize_order_never_swaps_rules_for_different_gear():
+    assigner = GearAssigner(trace=True)
+    first = GearRule("first", lambda a: True, "a")
+    second = GearRule("second", lambda a: True, "b")
+    assigner.add_rule(first)
+    assigner.add_rule(second)
+    # Make the second rule look much cheaper and hotter than the first
+    assigner.stats[first] = RuleStats("first")
+    assigner.stats[first].evaluations = 10
+    assigner.stats[first].hits = 1
+    assigner.stats[first].total_time = 10.0
+    assigner.stats[second] = RuleStats("second")
+    assigner.stats[second].evaluations = 9
+    assigner.stats[second].hits = 9
+
+    assigner.optimize_order()
+
+    assert assigner.rules == [first, second]
@@ -0,0 +1,104 @@
+"""Tests for diff-based planning of gear changes."""
+
+from types import SimpleNamespace
+
+from click.testing import CliRunner
+from stravalib.model import SummaryActivity
+
+from strava_gears.cli.main import cli
+from strava_gears.core.heuristics import GearAssigner, create_activity_type_rule
+from strava_gears.core.planner import GearChange, GearPlan, GearPlanner
+
+
+def make_activity(activity_id, activity_type="Ride", gear_id=None):
+    return SummaryActivity.model_validate(
+        {"id": activity_id, "name": f"Activity {activity_id}", "type": activity_type, "gear_id": gear_id}
+    )
+
+
+class FakeClient:
+    """Records gear updates against a dict of current gear per activity."""
+
+    def __init__(self, gear):
+        self.gear = dict(gear)
+        self.updates = []
+
+    def get_activity(self, activity_id):
+        return SimpleNamespace(id=activity_id, gear_id=self.gear.get(activity_id))
+
+    def update_activity_gear(self, activity_id, gear_id):
+        self.updates.append((activity_id, gear_id))
+        self.gear[activity_id] = gear_id
+
+
+def make_planner():
+    assigner = GearAssigner()
+    assigner.add_rule(create_activity_type_rule("Ride", "bike"))
+    assigner.add_rule(create_activity_type_rule("Run", "shoes"))
+    return GearPlanner(assigner)
+
+
+def test_plan_skips_activities_already_on_matched_gear():
+    plan = make_planner().plan(
+        [make_activity(1, "Ride", "bike"), make_activity(2, "Ride", "other"), make_activity(3, "Swim")]
+    )
+    assert [(c.activity_id, c.old_gear_id, c.new_gear_id) for c in plan] == [(2, "other", "bike")]
+
+
+def test_plan_drops_duplicate_activities():
+    plan = make_planner().plan([make_activity(1, "Ride"), make_activity(1, "Ride"), make_activity(2, "Run")])
+    assert [c.activity_id for c in plan] == [1, 2]
+
+
+def test_plan_groups_changes_by_rule():
+    plan = make_planner().plan([make_activity(1, "Run"), make_activity(2, "Ride"), make_activity(3, "Run")])
+    groups = plan.by_rule()
+    assert list(groups) == ["Type: Run", "Type: Ride"]
+    assert [c.activity_id for c in groups["Type: Run"]] == [1, 3]
+
+
+def test_export_load_round_trip(tmp_path):
+    plan = GearPlan([GearChange(1, "Ride", None, "bike", "Type: Ride"), GearChange(2, None, "old", "shoes", "r")])
+    path = tmp_path / "plan.json"
+    plan.export(path)
+
+    loaded = GearPlan.load(path)
+
+    assert loaded.to_dict() == plan.to_dict()
+
+
+def test_execute_applies_all_changes():
+    plan = GearPlan([GearChange(1, "a", None, "bike", "r"), GearChange(2, "b", "old", "bike", "r")])
+    client = FakeClient({1: None, 2: "old"})
+    applied = []
+
+    assert plan.execute(client, on_change=applied.append) == 2
+    assert client.updates == [(1, "bike"), (2, "bike")]
+    assert [c.activity_id for c in applied] == [1, 2]
+
+
+def test_execute_verify_skips_stale_changes():
+    plan = GearPlan([GearChange(1, "a", None, "bike", "r"), GearChange(2, "b", "old", "bike", "r")])
+    # Activity 2 was edited by hand after the plan was made
+    client = FakeClient({1: None, 2: "edited"})
+    skipped = []
+
+    assert plan.execute(client, on_skip=skipped.append, verify=True) == 1
+    assert client.updates == [(1, "bike")]
+    assert [c.activity_id for c in skipped] == [2]
+
+
+def test_apply_command(tmp_path, monkeypatch):
+    plan_path = tmp_path / "plan.json"
+    GearPlan([GearChange(1, "a", None, "bike", "r"), GearChange(2, "b", "old", "bike", "r")]).export(plan_path)
+    client = FakeClient({1: None, 2: "edited"})
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("STRAVA_GEARS_STORAGE", raising=False)
+    monkeypatch.setattr("strava_gears.cli.assign.get_client", lambda ctx: client)
+
+    result = CliRunner().invoke(cli, ["apply", "--plan", str(plan_path)])
+
+    assert result.exit_code == 0, result.output
+    assert client.updates == [(1, "bike")]
+    assert "Skipped activity 2" in result.output
+    assert "updated 1 of 2 activities" in result.output
@@ -0,0 +1,95 @@
+"""Tests for the shared rate limiter."""
+
+from strava_gears.core.ratelimit import LONG_PERIOD, SHORT_PERIOD, SharedRateLimiter, SharedRateLimitRule
+
+# 2024-01-01 10:05:00 UTC, 10 minutes before the end of the 15-minute period
+NOW = 1704103500.0
+
+
+def headers(short_usage, long_usage, short_limit=100, long_limit=1000):
+    return {
+        "X-RateLimit-Limit": f"{short_limit},{long_limit}",
+        "X-RateLimit-Usage": f"{short_usage},{long_usage}",
+    }
+
+
+class Worker:
+    """A rate limit rule with a fake clock that records its sleeps."""
+
+    def __init__(self, storage, now=NOW, priority="high"):
+        self.now = now
+        self.sleeps = []
+        self.rule = SharedRateLimitRule(storage, priority=priority, sleep=self.sleeps.append, clock=lambda: self.now)
+
+    def __call__(self, response_headers):
+        self.rule(response_headers, "GET")
+
+
+def test_limiter_uses_shared_rule(storage):
+    limiter = SharedRateLimiter(storage)
+    assert isinstance(limiter.rules[0], SharedRateLimitRule)
+    assert limiter.rules[0].storage is storage
+
+
+def test_records_rates(storage):
+    worker = Worker(storage)
+    worker(headers(10, 200))
+
+    stored = storage.get("ratelimit", "rates")
+    assert (stored["short_usage"], stored["long_usage"]) == (10, 200)
+    assert (stored["short_limit"], stored["long_limit"]) == (100, 1000)
+    assert worker.sleeps == []
+
+
+def test_waits_for_limit_reached_by_other_worker(storage):
+    first, second = Worker(storage), Worker(storage)
+    first(headers(100, 500))
+    # The second worker's response is older and reports lower usage
+    second(headers(60, 450))
+
+    assert first.sleeps == [SHORT_PERIOD - NOW % SHORT_PERIOD]
+    assert second.sleeps == [SHORT_PERIOD - NOW % SHORT_PERIOD]
+    assert storage.get("ratelimit", "rates")["short_usage"] == 100
+
+
+def test_waits_without_rate_headers(storage):
+    Worker(storage)(headers(100, 500))
+    worker = Worker(storage)
+    worker({})
+    assert worker.sleeps == [SHORT_PERIOD - NOW % SHORT_PERIOD]
+
+
+def test_long_limit(storage):
+    Worker(storage)(headers(10, 1000))
+    worker = Worker(storage)
+    worker(headers(5, 900))
+    assert worker.sleeps == [LONG_PERIOD - NOW % LONG_PERIOD]
+
+
+def test_short_usage_resets_in_next_period(storage):
+    Worker(storage)(headers(100, 500))
+    worker = Worker(storage, now=NOW + SHORT_PERIOD)
+    worker(headers(1, 501))
+
+    assert worker.sleeps == []
+    stored = storage.get("ratelimit", "rates")
+    assert (stored["short_usage"], stored["long_usage"]) == (1, 501)
+
+
+def test_long_usage_resets_on_next_day(storage):
+    Worker(storage)(headers(10, 1000))
+    worker = Worker(storage, now=NOW + LONG_PERIOD)
+    worker({})
+    assert worker.sleeps == []
+
+    worker(headers(1, 1))
+    stored = storage.get("ratelimit", "rates")
+    assert (stored["short_usage"], stored["long_usage"]) == (1, 1)
+
+
+def test_medium_priority_spreads_shared_usage(storage):
+    Worker(storage)(headers(80, 500))
+    worker = Worker(storage, priority="medium")
+    worker(headers(10, 100))
+    # 20 requests left in the 600 seconds until the period ends
+    assert worker.sleeps == [(SHORT_PERIOD - NOW % SHORT_PERIOD) / 20]
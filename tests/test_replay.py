@@ -0,0 +1,214 @@
+"""Tests for recording and replaying API responses."""
+
+import logging
+import os
+from datetime import UTC, datetime, timedelta
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from click.testing import CliRunner
+
+from strava_gears.cli import main
+from strava_gears.cli.main import cli
+from strava_gears.core.client import StravaClient
+from strava_gears.core.config import Config
+from strava_gears.core.replay import FixtureArchive, RecordingSession, ReplaySession
+
+API = "https://www.strava.com/api/v3"
+START = datetime(2024, 1, 1, 8, tzinfo=UTC)
+
+
+def make_activity(activity_id, days, activity_type="Ride", gear_id=None):
+    return {
+        "id": activity_id,
+        "name": f"Activity {activity_id}",
+        "type": activity_type,
+        "sport_type": activity_type,
+        "distance": 10000.0,
+        "gear_id": gear_id,
+        "start_date": (START + timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    """An archive with one athlete, two gear items and ten weekly activities."""
+    archive = FixtureArchive()
+    archive.record(
+        "GET",
+        f"{API}/athlete",
+        {
+            "id": 1,
+            "firstname": "Test",
+            "lastname": "Athlete",
+            "bikes": [{"id": "b1", "name": "Road bike", "distance": 1000.0}],
+            "shoes": [{"id": "g1", "name": "Running shoes", "distance": 500.0}],
+        },
+    )
+    archive.record(
+        "GET",
+        f"{API}/athlete/activities",
+        [make_activity(i, 7 * i, "Run" if i % 2 else "Ride", gear_id="b1" if i == 4 else None) for i in range(1, 11)],
+    )
+    archive.record("GET", f"{API}/gear/b1", {"id": "b1", "name": "Road bike", "distance": 1000.0, "brand_name": "Acme"})
+    archive.record("GET", f"{API}/gear/g1", {"id": "g1", "name": "Running shoes", "distance": 500.0})
+    path = tmp_path / "archive.json.gz"
+    archive.save(path)
+    return path
+
+
+def ids(activities):
+    return [activity["id"] for activity in activities]
+
+
+def epoch(days):
+    return (START + timedelta(days=days)).timestamp()
+
+
+def test_round_trip(archive_path):
+    archive = FixtureArchive.load(archive_path)
+    assert archive.athlete["firstname"] == "Test"
+    assert len(archive.activities) == 10
+    assert archive.serve("GET", f"{API}/activities/3", {})["id"] == 3
+    assert archive.serve("GET", f"{API}/activities/99", {}) is None
+
+
+def test_list_activities_newest_first(archive_path):
+    archive = FixtureArchive.load(archive_path)
+    assert ids(archive.list_activities({})) == list(range(10, 0, -1))
+
+
+def test_list_activities_before_after(archive_path):
+    archive = FixtureArchive.load(archive_path)
+    # Both bounds are exclusive
+    assert ids(archive.list_activities({"before": epoch(35)})) == [4, 3, 2, 1]
+    assert ids(archive.list_activities({"after": epoch(14), "before": epoch(42)})) == [5, 4, 3]
+
+
+def test_list_activities_after_only_is_ascending(archive_path):
+    archive = FixtureArchive.load(archive_path)
+    assert ids(archive.list_activities({"after": epoch(49)})) == [8, 9, 10]
+
+
+def test_list_activities_paging(archive_path):
+    archive = FixtureArchive.load(archive_path)
+    assert ids(archive.list_activities({"page": 1, "per_page": 4})) == [10, 9, 8, 7]
+    assert ids(archive.list_activities({"page": 3, "per_page": 4})) == [2, 1]
+    assert archive.list_activities({"page": 4, "per_page": 4}) == []
+
+
+def test_list_activities_sees_recorded_activities(archive_path):
+    archive = FixtureArchive.load(archive_path)
+    assert ids(archive.list_activities({"page": 1, "per_page": 2})) == [10, 9]
+    archive.record("GET", f"{API}/athlete/activities", [make_activity(11, 77)])
+    assert ids(archive.list_activities({"page": 1, "per_page": 2})) == [11, 10]
+
+
+def test_replay_is_read_only(archive_path):
+    archive = FixtureArchive.load(archive_path)
+    with pytest.raises(ValueError):
+        archive.serve("PUT", f"{API}/activities/1", {})
+
+
+def test_client_from_archive(archive_path, caplog):
+    client = StravaClient.from_archive(archive_path)
+    with caplog.at_level(logging.WARNING):
+        assert [a.id for a in client.get_activities(limit=3)] == [10, 9, 8]
+        assert [a.id for a in client.get_activities(limit=None, activity_types=["Ride"])] == [10, 8, 6, 4, 2]
+        window = client.get_activities(limit=None, after=START + timedelta(days=20), before=START + timedelta(days=50))
+        assert [a.id for a in window] == [7, 6, 5, 4, 3]
+        assert {g.id for g in client.get_athlete_gear()} == {"b1", "g1"}
+        assert client.get_gear("b1").brand_name == "Acme"
+    assert caplog.records == []
+
+
+def test_client_from_archive_leaves_environment_untouched(archive_path, monkeypatch):
+    monkeypatch.delenv("SILENCE_TOKEN_WARNINGS", raising=False)
+    StravaClient.from_archive(archive_path)
+    assert "SILENCE_TOKEN_WARNINGS" not in os.environ
+
+
+def test_cli_against_archive(archive_path, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("STRAVA_GEARS_STORAGE", raising=False)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["--replay", str(archive_path), "list-activities", "--limit", "2"])
+    assert result.exit_code == 0, result.output
+    assert "Found 2 activities" in result.output
+    assert "ID: 10" in result.output
+
+    result = runner.invoke(cli, ["--replay", str(archive_path), "list-gear"])
+    assert result.exit_code == 0, result.output
+    assert "Road bike" in result.output
+
+    result = runner.invoke(
+        cli, ["--replay", str(archive_path), "auto-assign", "--activity-type", "Ride", "--gear-id", "b1", "--dry-run"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Would update 4 activities" in result.output
+
+
+class FakeStravaAdapter(requests.adapters.BaseAdapter):
+    """Transport adapter answering Strava API requests from an archive."""
+
+    def __init__(self, archive):
+        super().__init__()
+        self.session = ReplaySession(archive)
+
+    def send(self, request, **kwargs):
+        url = urlparse(request.url)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        return self.session.request(request.method, url._replace(query="").geturl(), params=params)
+
+    def close(self):
+        pass
+
+
+def test_record_then_replay(archive_path, tmp_path):
+    fixtures = FixtureArchive()
+    session = RecordingSession(fixtures)
+    session.mount("https://", FakeStravaAdapter(FixtureArchive.load(archive_path)))
+    client = StravaClient("token", requests_session=session)
+    client.get_athlete()
+    client.get_gear("b1")
+    assert len(client.get_activities(limit=None)) == 10
+
+    recorded = tmp_path / "recorded.json.gz"
+    fixtures.save(recorded)
+
+    replayed = StravaClient.from_archive(recorded)
+    assert replayed.get_athlete().firstname == "Test"
+    assert [a.id for a in replayed.get_activities(limit=None)] == list(range(10, 0, -1))
+    assert replayed.get_gear("b1").brand_name == "Acme"
+
+
+def test_cli_record(archive_path, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("STRAVA_GEARS_STORAGE", raising=False)
+    Config().set_access_token("token", "refresh", 2**31)
+
+    class FakeRecordingSession(RecordingSession):
+        def __init__(self, archive):
+            super().__init__(archive)
+            self.mount("https://", FakeStravaAdapter(FixtureArchive.load(archive_path)))
+
+    monkeypatch.setattr(main, "RecordingSession", FakeRecordingSession)
+    recorded = tmp_path / "recorded.json.gz"
+    result = CliRunner().invoke(cli, ["record", "--archive", str(recorded)])
+    assert result.exit_code == 0, result.output
+    assert "Recorded 10 activities" in result.output
+
+    archive = FixtureArchive.load(recorded)
+    assert set(archive.gear) == {"b1", "g1"}
+    assert archive.gear["b1"]["brand_name"] == "Acme"
+
+
+def test_replay_does_not_refresh_with_credentials_in_environment(archive_path, monkeypatch, caplog):
+    monkeypatch.setenv("STRAVA_CLIENT_ID", "12345")
+    monkeypatch.setenv("STRAVA_CLIENT_SECRET", "secret")
+    client = StravaClient.from_archive(archive_path)
+    with caplog.at_level(logging.WARNING):
+        assert len(client.get_activities(limit=5)) == 5
+    assert caplog.records == []
@@ -0,0 +1,91 @@
+"""Tests for the storage backends."""
+
+import threading
+
+import pytest
+
+from strava_gears.core.storage import RedisStorage, SQLiteStorage, open_storage
+
+
+def test_get_missing_returns_default(storage):
+    assert storage.get("config", "missing") is None
+    assert storage.get("config", "missing", "default") == "default"
+
+
+def test_set_and_get(storage):
+    storage.set("config", "client_id", "123")
+    assert storage.get("config", "client_id") == "123"
+
+
+def test_set_many_and_items(storage):
+    storage.set_many("tokens", {"access_token": "a", "refresh_token": "r", "expires_at": 1700000000})
+    assert storage.items("tokens") == {"access_token": "a", "refresh_token": "r", "expires_at": 1700000000}
+
+
+def test_set_many_overwrites(storage):
+    storage.set("tokens", "access_token", "old")
+    storage.set_many("tokens", {"access_token": "new"})
+    assert storage.get("tokens", "access_token") == "new"
+
+
+def test_non_str_values_round_trip(storage):
+    values = {"int": 5, "float": 1.5, "bool": True, "none": None, "list": [1, "a"], "dict": {"nested": [1, 2]}}
+    storage.set_many("config", values)
+    for key, value in values.items():
+        assert storage.get("config", key, "missing") == value
+    assert storage.items("config") == values
+
+
+def test_namespaces_are_separate(storage):
+    storage.set("config", "key", "config value")
+    storage.set("tokens", "key", "token value")
+    assert storage.get("config", "key") == "config value"
+    assert storage.items("tokens") == {"key": "token value"}
+
+
+def test_delete(storage):
+    storage.set_many("config", {"a": 1, "b": 2})
+    storage.delete("config", "a")
+    storage.delete("config", "missing")
+    assert storage.items("config") == {"b": 2}
+
+
+def test_sqlite_shared_between_connections(tmp_path):
+    first = SQLiteStorage(tmp_path / "shared.db")
+    second = SQLiteStorage(tmp_path / "shared.db")
+    first.set("tokens", "access_token", "a")
+    assert second.get("tokens", "access_token") == "a"
+
+
+def test_sqlite_uses_wal(tmp_path):
+    storage = SQLiteStorage(tmp_path / "wal.db")
+    assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_concurrent_writes(tmp_path):
+    storage = SQLiteStorage(tmp_path / "concurrent.db")
+    threads = [threading.Thread(target=storage.set, args=("n", str(i), i)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert storage.items("n") == {str(i): i for i in range(20)}
+
+
+def test_open_storage(tmp_path, monkeypatch):
+    monkeypatch.delenv("STRAVA_GEARS_STORAGE", raising=False)
+    default = open_storage(None, tmp_path)
+    assert isinstance(default, SQLiteStorage)
+    assert default.path == tmp_path / "strava-gears.db"
+
+    custom = open_storage(f"sqlite://{tmp_path / 'custom.db'}", tmp_path)
+    assert isinstance(custom, SQLiteStorage)
+    assert custom.path == tmp_path / "custom.db"
+
+    with pytest.raises(ValueError):
+        open_storage("memcached://localhost", tmp_path)
+
+
+def test_redis_keys_are_prefixed(fake_redis):
+    RedisStorage("", prefix="workers", client=fake_redis).set("tokens", "access_token", "a")
+    assert list(fake_redis.data) == ["workers:tokens"]